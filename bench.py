@@ -0,0 +1,326 @@
+"""Reproducible micro-benchmarks for the DSP kernels in this repo.
+
+    python bench.py run -o results.json [-k fft] [--repeats 15] [--warmup 3]
+                        [--backend numpy|scipy|pyfftw]
+    python bench.py compare baseline.json results.json [--threshold 0.1]
+
+Each case is warmed up, timed ``repeats`` times (median and IQR reported)
+and then run once more under tracemalloc to record peak memory. ``compare``
+exits non-zero when a case got slower by more than ``threshold`` and the two
+IQRs do not overlap.
+"""
+
+import argparse
+import datetime
+import gc
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import transforms
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_script(name, relpath):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relpath))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+###############
+# Bench cases #
+###############
+# Each setup returns a zero-argument callable; ``iterations`` is how many
+# solver iterations one call performs, so results are reported per iteration.
+CASES = []
+
+
+def case(name, iterations=1, **params):
+    def decorator(setup):
+        CASES.append(
+            {
+                "name": name,
+                "setup": lambda: setup(**params),
+                "iterations": iterations,
+                "params": params,
+            }
+        )
+        return setup
+
+    return decorator
+
+
+def _conv_inputs(n):
+    rng = np.random.default_rng(0)
+    return rng.standard_normal(n), np.ones(n)
+
+
+for _n in (256, 1024, 2048):
+
+    @case(f"conv.direct[n={_n}]", n=_n)
+    def _direct_conv(n):
+        conv = load_script("fft_temp", "fft/temp.py")
+        signal, kernel = _conv_inputs(n)
+        return lambda: conv.direct_convolution(signal, kernel)
+
+
+for _n in (1024, 16384, 262144):
+
+    @case(f"conv.fft[n={_n}]", n=_n)
+    def _fft_conv(n):
+        conv = load_script("fft_temp", "fft/temp.py")
+        signal, kernel = _conv_inputs(n)
+        return lambda: conv.fft_convolution(signal, kernel)
+
+
+for _size in (256, 512):
+
+    @case(f"dct2[{_size}x{_size}]", size=_size)
+    def _dct2(size):
+        img = np.random.default_rng(0).random((size, size))
+        return lambda: transforms.dctn(img, norm="ortho")
+
+    @case(f"idct2[{_size}x{_size}]", size=_size)
+    def _idct2(size):
+        coeffs = np.random.default_rng(0).standard_normal((size, size))
+        return lambda: transforms.idctn(coeffs, norm="ortho")
+
+
+def _sensing_op(size, sample_pct=20):
+    import pylops
+
+    num_pixels = size * size
+    rng = np.random.default_rng(0)
+    sample_idx = np.sort(
+        rng.choice(num_pixels, size=int(sample_pct / 100 * num_pixels), replace=False)
+    )
+    dct_op = transforms.dctn_operator((size, size), dtype="float64")
+    restrict_op = pylops.Restriction(num_pixels, sample_idx, dtype="float64")
+    return restrict_op * dct_op.H, len(sample_idx)
+
+
+@case("cs.sensing_matvec[256x256]", size=256)
+def _sensing_matvec(size):
+    op, _ = _sensing_op(size)
+    x = np.random.default_rng(1).standard_normal(size * size)
+    return lambda: op @ x
+
+
+@case("cs.sensing_rmatvec[256x256]", size=256)
+def _sensing_rmatvec(size):
+    op, num_samples = _sensing_op(size)
+    y = np.random.default_rng(1).standard_normal(num_samples)
+    return lambda: op.H @ y
+
+
+@case("cs.sensing_matrix_1d[n=5000,m=250]", n=5000, m=250)
+def _sensing_matrix_1d(n, m):
+    cs_idx = np.sort(np.random.default_rng(0).choice(n, size=m, replace=False))
+    return lambda: transforms.dct(np.eye(n)[:, cs_idx], axis=0, norm="ortho").T
+
+
+@case("fista.iteration[256x256]", iterations=20, size=256, niter=20)
+def _fista(size, niter):
+    from pylops.optimization.sparsity import fista
+
+    op, num_samples = _sensing_op(size)
+    y = np.random.default_rng(2).random(num_samples)
+    # Estimate the step size once, as fista would on every call, so only the
+    # iterations themselves are timed
+    alpha = 1.0 / np.abs((op.H @ op).eigs(neigs=1, symmetric=True)[0])
+    return lambda: fista(op, y, niter=niter, eps=0.02, alpha=alpha, show=False)
+
+
+@case("hio.iteration[256x256]", iterations=20, size=256, niter=20)
+def _hio(size, niter):
+    hio = load_script("fft_main", "fft/main.py")
+    obs_mag = np.abs(transforms.fft2(np.random.default_rng(0).random((size, size))))
+
+    def run():
+        np.random.seed(0)
+        return hio.hio_reconstruction(obs_mag, iterations=niter)
+
+    return run
+
+
+@case("stft.stream[fs=10MHz,1M samples]", fs=10e6, num_samples=1 << 20, block=8192)
+def _stft_stream(fs, num_samples, block):
+    import streaming
+
+    signal = np.random.default_rng(0).standard_normal(num_samples)
+
+    def run():
+        monitor = streaming.AliasingMonitor(fs, frame_len=1024, hop=512)
+        for i in range(0, num_samples, block):
+            monitor.process(signal[i : i + block])
+
+    return run
+
+
+###############
+# Measurement #
+###############
+def measure(func, repeats, warmup):
+    for _ in range(warmup):
+        func()
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return np.array(times), peak_bytes
+
+
+def run_case(bench_case, repeats, warmup):
+    func = bench_case["setup"]()
+    times, peak_bytes = measure(func, repeats, warmup)
+    times = times / bench_case["iterations"]
+    q1, median, q3 = np.percentile(times, [25, 50, 75])
+    return {
+        "median_s": float(median),
+        "iqr_s": float(q3 - q1),
+        "q1_s": float(q1),
+        "q3_s": float(q3),
+        "min_s": float(times.min()),
+        "repeats": repeats,
+        "warmup": warmup,
+        "iterations": bench_case["iterations"],
+        "peak_bytes": int(peak_bytes),
+        "params": bench_case["params"],
+    }
+
+
+def environment():
+    import scipy
+
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "transform_backends": transforms.available_backends(),
+    }
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def select_cases(name_filter=None):
+    return [c for c in CASES if not name_filter or name_filter in c["name"]]
+
+
+def cmd_run(args):
+    if args.backend:
+        transforms.set_backend(args.backend)
+    results = {}
+    for bench_case in select_cases(args.filter):
+        try:
+            result = run_case(bench_case, args.repeats, args.warmup)
+        except ImportError as exc:
+            print(f"{bench_case['name']:<40} skipped ({exc})")
+            continue
+        results[bench_case["name"]] = result
+        print(
+            f"{bench_case['name']:<40} median {format_time(result['median_s'])}"
+            f"  iqr {format_time(result['iqr_s'])}"
+            f"  peak {result['peak_bytes'] / 2**20:8.2f} MiB"
+        )
+
+    with open(args.output, "w") as f:
+        env = environment()
+        env["transform_backend"] = transforms.current_backend() or "auto"
+        json.dump({"environment": env, "results": results}, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+    return 0
+
+
+def cmd_compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(args.candidate) as f:
+        candidate = json.load(f)["results"]
+
+    regressions = []
+    for name in list(baseline) + [n for n in candidate if n not in baseline]:
+        if name not in baseline or name not in candidate:
+            where = "baseline" if name not in baseline else "candidate"
+            print(f"{name:<40} missing from {where}")
+            continue
+        base, new = baseline[name], candidate[name]
+        ratio = new["median_s"] / base["median_s"]
+        status = ""
+        # Only flag changes that clear both the threshold and the noise band
+        if ratio > 1 + args.threshold and new["q1_s"] > base["q3_s"]:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - args.threshold and new["q3_s"] < base["q1_s"]:
+            status = "improved"
+        mem_ratio = new["peak_bytes"] / max(base["peak_bytes"], 1)
+        print(
+            f"{name:<40} {format_time(base['median_s'])} -> {format_time(new['median_s'])}"
+            f"  x{ratio:5.2f}  mem x{mem_ratio:5.2f}  {status}"
+        )
+
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmark suite")
+    run_parser.add_argument("-o", "--output", default="bench_results.json")
+    run_parser.add_argument("-k", "--filter", help="only run cases whose name contains this")
+    run_parser.add_argument("--repeats", type=int, default=15)
+    run_parser.add_argument("--warmup", type=int, default=3)
+    run_parser.add_argument(
+        "--backend", help="pin the transforms backend instead of autotuning"
+    )
+    run_parser.set_defaults(func=cmd_run)
+
+    compare_parser = subparsers.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    compare_parser.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
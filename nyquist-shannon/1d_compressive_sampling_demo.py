@@ -1,8 +1,14 @@
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.fft import dct, idct
 import cvxpy as cp
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import tracing  # noqa: E402
+from transforms import dct, idct  # noqa: E402
+
 np.random.seed(42)
 plt.rcParams.update(
     {
@@ -74,10 +80,12 @@ axs[1].legend()
 cs_idx = np.sort(np.random.choice(n, size=m, replace=False))
 cs_b = orig_signal[cs_idx]
 
-cs_A = dct(np.eye(n)[:, cs_idx], axis=0, norm="ortho").T
+with tracing.span("sensing_matrix", n=n, m=m):
+    cs_A = dct(np.eye(n)[:, cs_idx], axis=0, norm="ortho").T
 
 # L2 recovery
-cs_x_l2 = np.linalg.pinv(cs_A) @ cs_b
+with tracing.span("l2_recovery"):
+    cs_x_l2 = np.linalg.pinv(cs_A) @ cs_b
 cs_u_l2 = idct(cs_x_l2, norm="ortho")
 cs_x_l2_norm = normalize(cs_x_l2)
 
@@ -101,7 +109,13 @@ axs[1].legend()
 # L1 recovery
 cs_x_var = cp.Variable(n)
 cs_prob = cp.Problem(cp.Minimize(cp.norm1(cs_x_var)), [cs_A @ cs_x_var == cs_b])
-cs_prob.solve()
+with tracing.span("cvxpy.solve", cat="solver") as solve_span:
+    cs_prob.solve()
+    solve_span.set(
+        status=cs_prob.status,
+        solver=cs_prob.solver_stats.solver_name,
+        num_iters=cs_prob.solver_stats.num_iters,
+    )
 
 cs_x_l1 = cs_x_var.value
 cs_u_l1 = idct(cs_x_l1, norm="ortho")
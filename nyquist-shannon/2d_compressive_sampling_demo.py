@@ -1,10 +1,16 @@
+import os
+import sys
+
 import numpy as np
-from scipy.fft import dctn, idctn
 import matplotlib.pyplot as plt
 from PIL import Image
 import pylops
 from pylops.optimization.sparsity import fista
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import tracing  # noqa: E402
+from transforms import dctn, dctn_operator, idctn  # noqa: E402
+
 # Load image
 img = Image.open("lenna.png").convert("L")
 img = np.asarray(img, dtype=float) / 255.0
@@ -27,10 +33,11 @@ axs[1].set_title("2D DCT magnitude (log)")
 # Sparsify - keep top % coefficients
 keep_pct = 2
 num_keep = int(keep_pct / 100 * num_pixels)
-flat = np.abs(dct_coeffs).ravel()
-thresh = np.partition(flat, -num_keep)[-num_keep]
-mask = np.abs(dct_coeffs) >= thresh
-dct_sparse = dct_coeffs * mask
+with tracing.span("sparsify", keep_pct=keep_pct):
+    flat = np.abs(dct_coeffs).ravel()
+    thresh = np.partition(flat, -num_keep)[-num_keep]
+    mask = np.abs(dct_coeffs) >= thresh
+    dct_sparse = dct_coeffs * mask
 img_reconstructed = idctn(dct_sparse, norm="ortho")
 
 dct_sparse_mag = np.log1p(np.abs(dct_sparse))
@@ -50,7 +57,7 @@ num_samples = int(sample_pct / 100 * num_pixels)
 sample_idx = np.sort(np.random.choice(num_pixels, size=num_samples, replace=False))
 
 # Define operators
-dct_op = pylops.signalprocessing.DCT(dims=(height, width), dtype="float64")
+dct_op = dctn_operator((height, width), dtype="float64")
 restrict_op = pylops.Restriction(num_pixels, sample_idx, dtype="float64")
 
 # Get measurements
@@ -62,9 +69,15 @@ sensing_op = restrict_op * dct_op.H
 # Reconstruct with FISTA
 lambda_reg = 0.02
 num_iters = 500
-x_reconstructed, _, _ = fista(
-    sensing_op, measurements, niter=num_iters, eps=lambda_reg, show=False
-)
+with tracing.span("fista", cat="solver", niter=num_iters):
+    x_reconstructed, _, _ = fista(
+        sensing_op,
+        measurements,
+        niter=num_iters,
+        eps=lambda_reg,
+        show=False,
+        callback=tracing.iteration_callback("fista.iteration"),
+    )
 img_cs_reconstructed = (dct_op.H @ x_reconstructed).reshape(height, width)
 
 # Create sampled image for visualization
@@ -1,3 +1,6 @@
+import os
+import sys
+
 import numpy as np
 from manim import (
     BLACK,
@@ -21,6 +24,9 @@ from manim import (
     config,
 )
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import tracing  # noqa: E402
+
 SIGNAL_FREQ = 3
 ALIAS_FREQ = 2 
 ANALOG_COLOR = "#4A90E2"
@@ -84,7 +90,8 @@ class AliasingVisualisation(Scene):
             .set_color(BLACK)
             .shift(DOWN * 1.0)
         )
-        self.play(Create(axes), run_time=2.0)
+        with tracing.span("scene.axes", cat="render"):
+            self.play(Create(axes), run_time=2.0)
 
         # Plot Analog Signal
         analog_signal = axes.plot(
@@ -97,8 +104,9 @@ class AliasingVisualisation(Scene):
             "Original Signal: 3 Hz", font_size=TEXT_FONT_SIZE, color=ANALOG_COLOR
         )
         signal_label.move_to([margin_x + 0.2, 3.5 + 0.05, 0], aligned_edge=DL)
-        self.play(Create(analog_signal), Write(signal_label), run_time=2.0)
-        self.wait()
+        with tracing.span("scene.analog_signal", cat="render"):
+            self.play(Create(analog_signal), Write(signal_label), run_time=2.0)
+            self.wait()
 
         # Sampling Animation Loop
         current_rate = 20
@@ -118,8 +126,9 @@ class AliasingVisualisation(Scene):
             color=SAMPLE_COLOR,
         )
         rate_text.move_to([margin_x + 0.2, 3.0 + 0.05, 0], aligned_edge=DL)
-        self.play(FadeIn(sampled_graph), Write(rate_text), run_time=2.0)
-        self.wait()
+        with tracing.span("scene.initial_sampling", cat="render", rate=current_rate):
+            self.play(FadeIn(sampled_graph), Write(rate_text), run_time=2.0)
+            self.wait()
 
         rates_to_test = [15, 10, 5]
 
@@ -141,36 +150,38 @@ class AliasingVisualisation(Scene):
                 color=SAMPLE_COLOR,
             )
             new_rate_text.move_to([margin_x + 0.2, 3.0 + 0.05, 0], aligned_edge=DL)
-            self.play(
-                ReplacementTransform(sampled_graph, new_sampled_graph),
-                Transform(rate_text, new_rate_text),
-                run_time=1.5,
-            )
-            sampled_graph = new_sampled_graph
-            self.wait(1.0)
+            with tracing.span("scene.resample", cat="render", rate=new_rate):
+                self.play(
+                    ReplacementTransform(sampled_graph, new_sampled_graph),
+                    Transform(rate_text, new_rate_text),
+                    run_time=1.5,
+                )
+                sampled_graph = new_sampled_graph
+                self.wait(1.0)
 
             # Aliasing Reveal
             if new_rate == 5:
-                self.play(analog_signal.animate.set_stroke(opacity=0.3))
-
-                alias_explanation = Text(
-                    "Aliasing! The samples form a 2 Hz wave",
-                    font_size=TEXT_FONT_SIZE,
-                    color=ALIAS_COLOR,
-                )
-                alias_explanation.move_to(
-                    [margin_x + 0.2, 2.5 + 0.05, 0], aligned_edge=DL
-                )
-
-                self.play(Write(alias_explanation))
-
-                alias_sine = axes.plot(
-                    lambda t: -np.sin(2 * np.pi * ALIAS_FREQ * t),
-                    x_range=[0, 1],
-                    color=ALIAS_COLOR,
-                    stroke_width=4,
-                )
-
-                self.play(Create(alias_sine), run_time=2)
-                self.play(sampled_graph.animate.scale(1.2).scale(1 / 1.2))
-                self.wait(3.0)
+                with tracing.span("scene.aliasing_reveal", cat="render"):
+                    self.play(analog_signal.animate.set_stroke(opacity=0.3))
+
+                    alias_explanation = Text(
+                        "Aliasing! The samples form a 2 Hz wave",
+                        font_size=TEXT_FONT_SIZE,
+                        color=ALIAS_COLOR,
+                    )
+                    alias_explanation.move_to(
+                        [margin_x + 0.2, 2.5 + 0.05, 0], aligned_edge=DL
+                    )
+
+                    self.play(Write(alias_explanation))
+
+                    alias_sine = axes.plot(
+                        lambda t: -np.sin(2 * np.pi * ALIAS_FREQ * t),
+                        x_range=[0, 1],
+                        color=ALIAS_COLOR,
+                        stroke_width=4,
+                    )
+
+                    self.play(Create(alias_sine), run_time=2)
+                    self.play(sampled_graph.animate.scale(1.2).scale(1 / 1.2))
+                    self.wait(3.0)
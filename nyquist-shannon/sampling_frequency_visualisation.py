@@ -1,3 +1,6 @@
+import os
+import sys
+
 import numpy as np
 from manim import (
     BLACK,
@@ -21,6 +24,10 @@ from manim import (
     config,
 )
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import tracing  # noqa: E402
+from streaming import is_alias_free  # noqa: E402
+
 ANALOG_COLOR = "#4A90E2"
 SPECTRUM_COLOR = "#E74C3C"
 SAMPLE_COLOR = "#FF8C00"
@@ -123,15 +130,17 @@ class SamplingFrequencyVisualisation(Scene):
         freq_title.set_color(SPECTRUM_COLOR).scale(0.7)
         freq_title.move_to([margin_x + 0.2, 0.9, 0], aligned_edge=DL)
 
-        self.play(Create(time_axes), Write(time_axis_labels), run_time=1.5)
-        self.play(Write(time_title), run_time=0.8)
-        self.play(Create(time_graph), run_time=2.0)
-        self.wait(0.5)
+        with tracing.span("scene.time_domain", cat="render"):
+            self.play(Create(time_axes), Write(time_axis_labels), run_time=1.5)
+            self.play(Write(time_title), run_time=0.8)
+            self.play(Create(time_graph), run_time=2.0)
+            self.wait(0.5)
 
-        self.play(Create(freq_axes), Write(freq_axis_labels), run_time=1.5)
-        self.play(Write(freq_title), run_time=0.8)
-        self.play(Create(original_spectrum), run_time=2.0)
-        self.wait(0.8)
+        with tracing.span("scene.frequency_domain", cat="render"):
+            self.play(Create(freq_axes), Write(freq_axis_labels), run_time=1.5)
+            self.play(Write(freq_title), run_time=0.8)
+            self.play(Create(original_spectrum), run_time=2.0)
+            self.wait(0.8)
 
         def make_samples(fs):
             n_min = int(np.floor(T_MIN * fs))
@@ -202,8 +211,7 @@ class SamplingFrequencyVisualisation(Scene):
             return tex
 
         def make_status_text(fs):
-            fn = fs / 2
-            if fn > B:
+            if is_alias_free(fs, B):
                 text = MathTex(r"\text{No aliasing: } f_s/2 > B", color=NYQUIST_COLOR)
             else:
                 text = MathTex(r"\text{Aliasing: } f_s/2 < B", color=SPECTRUM_COLOR)
@@ -216,37 +224,41 @@ class SamplingFrequencyVisualisation(Scene):
         fs_sequence = [2.0, 1.5, 1.0, 0.8, 0.6]
 
         fs = fs_sequence[0]
-        samples = make_samples(fs)
-        sampled_spectrum = make_sampled_spectrum(fs)
-        nyquist = make_nyquist_markers(fs)
-        fs_text = make_fs_text(fs)
-        status = make_status_text(fs)
-
-        self.play(FadeIn(samples), run_time=1.0)
-        self.play(
-            FadeTransform(original_spectrum, sampled_spectrum),
-            FadeIn(nyquist),
-            FadeIn(fs_text),
-            FadeIn(status),
-            run_time=2.0,
-        )
-        self.wait(1.2)
-
-        for new_fs in fs_sequence[1:]:
-            new_samples = make_samples(new_fs)
-            new_sampled_spectrum = make_sampled_spectrum(new_fs)
-            new_nyquist = make_nyquist_markers(new_fs)
-            new_fs_text = make_fs_text(new_fs)
-            new_status = make_status_text(new_fs)
-
+        with tracing.span("scene.build_sampling", cat="render", fs=fs):
+            samples = make_samples(fs)
+            sampled_spectrum = make_sampled_spectrum(fs)
+            nyquist = make_nyquist_markers(fs)
+            fs_text = make_fs_text(fs)
+            status = make_status_text(fs)
+
+        with tracing.span("scene.sampling", cat="render", fs=fs):
+            self.play(FadeIn(samples), run_time=1.0)
             self.play(
-                FadeTransform(samples, new_samples),
-                FadeTransform(sampled_spectrum, new_sampled_spectrum),
-                FadeTransform(nyquist, new_nyquist),
-                FadeTransform(fs_text, new_fs_text),
-                FadeTransform(status, new_status),
+                FadeTransform(original_spectrum, sampled_spectrum),
+                FadeIn(nyquist),
+                FadeIn(fs_text),
+                FadeIn(status),
                 run_time=2.0,
             )
+            self.wait(1.2)
+
+        for new_fs in fs_sequence[1:]:
+            with tracing.span("scene.build_sampling", cat="render", fs=new_fs):
+                new_samples = make_samples(new_fs)
+                new_sampled_spectrum = make_sampled_spectrum(new_fs)
+                new_nyquist = make_nyquist_markers(new_fs)
+                new_fs_text = make_fs_text(new_fs)
+                new_status = make_status_text(new_fs)
+
+            with tracing.span("scene.sampling", cat="render", fs=new_fs):
+                self.play(
+                    FadeTransform(samples, new_samples),
+                    FadeTransform(sampled_spectrum, new_sampled_spectrum),
+                    FadeTransform(nyquist, new_nyquist),
+                    FadeTransform(fs_text, new_fs_text),
+                    FadeTransform(status, new_status),
+                    run_time=2.0,
+                )
 
             samples = new_samples
             sampled_spectrum = new_sampled_spectrum
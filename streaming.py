@@ -0,0 +1,181 @@
+"""Streaming short-time spectra and a live aliasing monitor.
+
+Samples arrive in blocks of any size and are written into a preallocated,
+mirrored ring buffer (every sample is stored twice, ``capacity`` apart) so
+any frame is a contiguous slice. All frames completed by a block are taken
+as one strided view, windowed into a preallocated array and transformed
+with a single batched rFFT into preallocated spectrum and PSD buffers,
+which keeps per-sample Python overhead low enough for MHz sample rates.
+
+    python streaming.py  # sweep a tone past fs/2 and report throughput
+"""
+
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+import tracing
+import transforms
+
+
+def is_alias_free(fs, bandwidth, guard=0.0):
+    # The sampling theorem criterion f_s/2 > B, optionally with a guard band
+    # expressed as a fraction of f_s/2
+    return fs / 2 * (1 - guard) > bandwidth
+
+
+class RingBuffer:
+    def __init__(self, capacity, dtype=float):
+        self.capacity = capacity
+        self.buffer = np.zeros(2 * capacity, dtype=dtype)
+        self.written = 0
+
+    def write(self, block):
+        block = np.asarray(block)
+        n = len(block)
+        if n > self.capacity:
+            raise ValueError(f"block of {n} samples exceeds capacity {self.capacity}")
+        pos = self.written % self.capacity
+        first = min(n, self.capacity - pos)
+        for offset in (pos, pos + self.capacity):
+            self.buffer[offset : offset + first] = block[:first]
+        rest = n - first
+        if rest:
+            self.buffer[:rest] = block[first:]
+            self.buffer[self.capacity : self.capacity + rest] = block[first:]
+        self.written += n
+
+    def frames(self, start, length, hop, count):
+        # Zero-copy (count, length) view of frames starting at absolute
+        # sample index ``start``; the data must still be held in the ring
+        if start < self.written - self.capacity:
+            raise ValueError("requested samples were already overwritten")
+        if start + (count - 1) * hop + length > self.written:
+            raise ValueError("requested samples have not been written yet")
+        pos = start % self.capacity
+        itemsize = self.buffer.itemsize
+        return as_strided(
+            self.buffer[pos:],
+            shape=(count, length),
+            strides=(hop * itemsize, itemsize),
+            writeable=False,
+        )
+
+
+class StreamingSTFT:
+    def __init__(self, fs, frame_len=1024, hop=256, window=None, chunk=1 << 16):
+        if hop > frame_len:
+            raise ValueError("hop must not exceed frame_len")
+        self.fs = fs
+        self.frame_len = frame_len
+        self.hop = hop
+        self.chunk = chunk
+        if window is None:
+            # Periodic Hann, the usual choice for overlapping STFT frames
+            window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(frame_len) / frame_len)
+        self.window = np.asarray(window, dtype=float)
+        self.freqs = np.arange(frame_len // 2 + 1) * fs / frame_len
+
+        # One-sided power spectral density scaling
+        self.scale = np.full(len(self.freqs), 2 / (fs * np.sum(self.window**2)))
+        self.scale[0] /= 2
+        if frame_len % 2 == 0:
+            self.scale[-1] /= 2
+
+        self.ring = RingBuffer(frame_len + chunk)
+        max_frames = (chunk + frame_len) // hop + 1
+        self._windowed = np.empty((max_frames, frame_len))
+        self._spectrum = np.empty((max_frames, len(self.freqs)), dtype=complex)
+        self._psd = np.empty((max_frames, len(self.freqs)))
+        # Backend chosen once here, so batch sizes never autotune mid-stream
+        self._rfft = transforms.BatchedRFFT(max_frames, frame_len)
+        self.next_start = 0
+
+    def process(self, block):
+        # Returns (frame_times, psd) for every frame completed by ``block``;
+        # frame times are the frame centres in seconds. For blocks of up to
+        # ``chunk`` samples ``psd`` is a view of an internal buffer that the
+        # next call overwrites; copy it to keep it. Larger blocks return a
+        # new array.
+        block = np.asarray(block, dtype=float)
+        multiple_chunks = len(block) > self.chunk
+        times, spectra = [], []
+        for offset in range(0, len(block), self.chunk):
+            self.ring.write(block[offset : offset + self.chunk])
+            count = (self.ring.written - self.frame_len - self.next_start) // self.hop + 1
+            if count <= 0:
+                continue
+            with tracing.span("stft.frames", cat="stream", count=count):
+                frames = self.ring.frames(self.next_start, self.frame_len, self.hop, count)
+                windowed = np.multiply(frames, self.window, out=self._windowed[:count])
+                spectrum = self._rfft(windowed, out=self._spectrum)
+                psd = np.abs(spectrum, out=self._psd[:count])
+                psd *= psd
+                psd *= self.scale
+            starts = self.next_start + self.hop * np.arange(count)
+            times.append((starts + self.frame_len / 2) / self.fs)
+            spectra.append(psd.copy() if multiple_chunks else psd)
+            self.next_start += count * self.hop
+
+        if not spectra:
+            return np.empty(0), np.empty((0, len(self.freqs)))
+        if len(spectra) == 1:
+            return times[0], spectra[0]
+        return np.concatenate(times), np.concatenate(spectra)
+
+
+class AliasingMonitor:
+    def __init__(self, fs, frame_len=1024, hop=256, guard=0.05, threshold_db=-40.0):
+        self.fs = fs
+        self.guard = guard
+        self.threshold = 10 ** (threshold_db / 10)
+        self.stft = StreamingSTFT(fs, frame_len=frame_len, hop=hop)
+
+    def band_edge(self, psd):
+        # Highest frequency per frame whose power is within threshold_db of
+        # the frame peak; silent frames report 0
+        peak = psd.max(axis=1, keepdims=True)
+        above = psd > peak * self.threshold
+        last = psd.shape[1] - 1 - np.argmax(above[:, ::-1], axis=1)
+        return np.where(above.any(axis=1), self.stft.freqs[last], 0.0)
+
+    def process(self, block):
+        # Returns (frame_times, band_edges, aliased) for the completed frames.
+        # Energy reaching the guard band below fs/2 is the signature of a
+        # component at or beyond Nyquist folding back into the band.
+        times, psd = self.stft.process(block)
+        bandwidth = self.band_edge(psd)
+        aliased = ~is_alias_free(self.fs, bandwidth, self.guard)
+        tracing.count("aliased_frames", int(aliased.sum()))
+        return times, bandwidth, aliased
+
+
+if __name__ == "__main__":
+    fs = 10e6
+    duration = 0.5
+    block_size = 8192
+
+    # Tone sweeping linearly from 1 MHz to 9 MHz: it crosses fs/2 = 5 MHz
+    # halfway through and then folds back down the band
+    f0, f1 = 1e6, 9e6
+    t = np.arange(int(fs * duration)) / fs
+    phase = 2 * np.pi * (f0 * t + (f1 - f0) / (2 * duration) * t**2)
+    signal = np.sin(phase) + 0.01 * np.random.randn(len(t))
+
+    monitor = AliasingMonitor(fs, frame_len=1024, hop=512)
+
+    start_time = time.perf_counter()
+    results = [
+        monitor.process(signal[i : i + block_size])
+        for i in range(0, len(signal), block_size)
+    ]
+    elapsed = time.perf_counter() - start_time
+
+    times = np.concatenate([r[0] for r in results])
+    aliased = np.concatenate([r[2] for r in results])
+    print(f"Processed {len(signal)} samples in {elapsed:.3f} s")
+    print(f"Throughput: {len(signal) / elapsed / 1e6:.1f} MS/s (real time: {fs / 1e6:.1f} MS/s)")
+    print(f"Frames: {len(times)}, flagged as aliasing: {aliased.sum()}")
+    if aliased.any():
+        print(f"First flagged frame at t = {times[aliased][0] * 1e3:.2f} ms")
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+import bench
+import transforms
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    previous = transforms.current_backend()
+    yield
+    transforms.set_backend(previous)
+
+
+def result(median, iqr=0.1, peak_bytes=1000):
+    return {
+        "median_s": median,
+        "q1_s": median - iqr / 2,
+        "q3_s": median + iqr / 2,
+        "iqr_s": iqr,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def write_results(path, results):
+    with open(path, "w") as f:
+        json.dump({"environment": {}, "results": results}, f)
+    return str(path)
+
+
+def compare(tmp_path, baseline, candidate, *extra):
+    a = write_results(tmp_path / "baseline.json", baseline)
+    b = write_results(tmp_path / "candidate.json", candidate)
+    return bench.main(["compare", a, b, *extra])
+
+
+def flagged_line(output, name):
+    return next(line for line in output.splitlines() if line.startswith(name))
+
+
+def test_compare_flags_regression_beyond_threshold_and_noise(tmp_path, capsys):
+    assert compare(tmp_path, {"case[a]": result(1.0)}, {"case[a]": result(1.5)}) == 1
+    output = capsys.readouterr().out
+    assert "REGRESSION" in flagged_line(output, "case[a]")
+    assert "1 regression(s): case[a]" in output
+
+
+def test_compare_ignores_slowdown_within_threshold(tmp_path, capsys):
+    baseline = {"case": result(1.0, iqr=0.01)}
+    candidate = {"case": result(1.05, iqr=0.01)}
+    assert compare(tmp_path, baseline, candidate) == 0
+    assert "No regressions" in capsys.readouterr().out
+
+
+def test_compare_ignores_slowdown_with_overlapping_iqr(tmp_path, capsys):
+    baseline = {"case": result(1.0, iqr=1.0)}
+    candidate = {"case": result(1.3, iqr=1.0)}
+    assert compare(tmp_path, baseline, candidate) == 0
+    assert "REGRESSION" not in capsys.readouterr().out
+
+
+def test_compare_threshold_option(tmp_path):
+    baseline, candidate = {"case": result(1.0)}, {"case": result(1.5)}
+    assert compare(tmp_path, baseline, candidate, "--threshold", "0.6") == 0
+
+
+def test_compare_reports_improvements(tmp_path, capsys):
+    assert compare(tmp_path, {"case": result(1.0)}, {"case": result(0.5)}) == 0
+    assert "improved" in flagged_line(capsys.readouterr().out, "case")
+
+
+def test_compare_reports_missing_cases(tmp_path, capsys):
+    baseline = {"shared": result(1.0), "removed": result(1.0)}
+    candidate = {"shared": result(1.0), "added": result(1.0)}
+    assert compare(tmp_path, baseline, candidate) == 0
+    output = capsys.readouterr().out
+    assert "missing from candidate" in flagged_line(output, "removed")
+    assert "missing from baseline" in flagged_line(output, "added")
+
+
+def test_filter_matches_bracketed_names_as_substrings():
+    assert [c["name"] for c in bench.select_cases("dct2[")] == [
+        "dct2[256x256]",
+        "idct2[256x256]",
+        "dct2[512x512]",
+        "idct2[512x512]",
+    ]
+    assert [c["name"] for c in bench.select_cases("conv.fft[n=1024]")] == [
+        "conv.fft[n=1024]"
+    ]
+    assert len(bench.select_cases(None)) == len(bench.CASES)
+
+
+def test_run_writes_results_for_selected_cases(tmp_path):
+    output = tmp_path / "results.json"
+    args = ["run", "-o", str(output), "-k", "idct2[256x256]", "--repeats", "3"]
+    assert bench.main(args + ["--warmup", "0", "--backend", "numpy"]) == 0
+
+    with open(output) as f:
+        data = json.load(f)
+    assert list(data["results"]) == ["idct2[256x256]"]
+    assert data["environment"]["transform_backend"] == "numpy"
+    case = data["results"]["idct2[256x256]"]
+    assert case["repeats"] == 3
+    assert case["q1_s"] <= case["median_s"] <= case["q3_s"]
+    assert case["peak_bytes"] > 0
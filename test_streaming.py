@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+import streaming
+import transforms
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    previous = transforms.current_backend()
+    transforms.clear_choices()
+    yield
+    transforms.set_backend(previous)
+    transforms.clear_choices()
+
+
+def reference_psd(stft, x):
+    count = (len(x) - stft.frame_len) // stft.hop + 1
+    frames = np.stack(
+        [x[k * stft.hop : k * stft.hop + stft.frame_len] for k in range(count)]
+    )
+    return np.abs(np.fft.rfft(frames * stft.window, axis=-1)) ** 2 * stft.scale
+
+
+def test_ring_buffer_wraps_around():
+    ring = streaming.RingBuffer(8)
+    data = np.arange(30, dtype=float)
+    for start in range(0, 30, 5):
+        ring.write(data[start : start + 5])
+    # 30 samples written into 8 slots: the last 8 are still readable,
+    # including frames that straddle the wrap point
+    frames = ring.frames(22, 4, 2, 3)
+    np.testing.assert_array_equal(frames, [data[22:26], data[24:28], data[26:30]])
+
+
+def test_ring_buffer_rejects_overwritten_samples():
+    ring = streaming.RingBuffer(8)
+    ring.write(np.arange(8.0))
+    ring.write(np.arange(4.0))
+    with pytest.raises(ValueError, match="already overwritten"):
+        ring.frames(3, 4, 1, 1)
+
+
+def test_ring_buffer_rejects_unwritten_samples():
+    ring = streaming.RingBuffer(8)
+    ring.write(np.arange(6.0))
+    with pytest.raises(ValueError, match="not been written yet"):
+        ring.frames(0, 4, 2, 3)
+
+
+def test_ring_buffer_rejects_oversized_block():
+    ring = streaming.RingBuffer(8)
+    with pytest.raises(ValueError, match="exceeds capacity"):
+        ring.write(np.zeros(9))
+
+
+@pytest.mark.parametrize("backend", ["numpy", "scipy", "pyfftw"])
+def test_stft_matches_direct_rfft_with_irregular_blocks(backend):
+    if backend not in transforms.available_backends():
+        pytest.skip(f"{backend} is not installed")
+    transforms.set_backend(backend)
+    x = np.random.default_rng(0).standard_normal(20000)
+    stft = streaming.StreamingSTFT(1000.0, frame_len=256, hop=64, chunk=1000)
+
+    rng = np.random.default_rng(1)
+    times, spectra, start = [], [], 0
+    while start < len(x):
+        # Includes blocks smaller than a hop and larger than one chunk
+        size = int(rng.integers(1, 2500))
+        t, psd = stft.process(x[start : start + size])
+        times.append(t)
+        spectra.append(psd.copy())
+        start += size
+
+    expected = reference_psd(stft, x)
+    np.testing.assert_allclose(np.concatenate(spectra), expected, rtol=1e-9, atol=1e-15)
+    count = len(expected)
+    np.testing.assert_allclose(
+        np.concatenate(times), (np.arange(count) * 64 + 128) / 1000.0
+    )
+
+
+def test_stft_does_not_autotune_per_batch_size():
+    stft = streaming.StreamingSTFT(1e6, frame_len=128, hop=32, chunk=4096)
+    tuned = len(transforms.choices())
+    rng = np.random.default_rng(2)
+    for _ in range(50):
+        stft.process(rng.standard_normal(int(rng.integers(1, 4096))))
+    assert len(transforms.choices()) == tuned
+
+
+def test_stft_reuses_psd_buffer():
+    stft = streaming.StreamingSTFT(1000.0, frame_len=64, hop=16, chunk=512)
+    _, first = stft.process(np.ones(256))
+    _, second = stft.process(np.ones(256))
+    assert np.shares_memory(first, second)
+
+
+def test_aliasing_monitor_flags_tone_near_nyquist():
+    fs = 1000.0
+    t = np.arange(8192) / fs
+    monitor = streaming.AliasingMonitor(fs, frame_len=256, hop=128)
+    _, in_band, aliased = monitor.process(np.sin(2 * np.pi * 100 * t))
+    assert not aliased.any()
+    assert np.all(in_band < fs / 4)
+
+    monitor = streaming.AliasingMonitor(fs, frame_len=256, hop=128)
+    _, _, aliased = monitor.process(np.sin(2 * np.pi * 495 * t))
+    assert aliased.all()
+
+
+def test_is_alias_free_matches_sampling_criterion():
+    assert streaming.is_alias_free(2.0, 0.5)
+    assert not streaming.is_alias_free(0.8, 0.5)
+    assert not streaming.is_alias_free(1.0, 0.5)
@@ -0,0 +1,123 @@
+import json
+import time
+
+import pytest
+
+import tracing
+
+
+@pytest.fixture(autouse=True)
+def clean_tracing():
+    tracing.disable()
+    tracing.reset()
+    yield
+    tracing.disable()
+    tracing.reset()
+
+
+def events(ph=None):
+    return [e for e in tracing._events if ph is None or e["ph"] == ph]
+
+
+def test_disabled_hooks_record_nothing():
+    assert tracing.span("work") is tracing._NULL_SPAN
+    with tracing.span("work") as span:
+        span.set(size=3)
+    tracing.count("fft_calls")
+    assert tracing.iteration_callback("solver.iteration") is None
+
+    @tracing.traced()
+    def work():
+        return 42
+
+    assert work() == 42
+    assert tracing._events == []
+    assert tracing.counters() == {}
+
+
+def test_nested_spans_and_traced_produce_complete_events():
+    tracing.enable()
+
+    @tracing.traced("inner_func")
+    def inner():
+        time.sleep(0.001)
+
+    with tracing.span("outer", size=8) as span:
+        inner()
+        span.set(status="done")
+
+    inner_event, outer_event = events("X")
+    assert inner_event["name"] == "inner_func"
+    assert outer_event["name"] == "outer"
+    assert outer_event["args"] == {"size": 8, "status": "done"}
+    assert inner_event["dur"] >= 1000
+    assert outer_event["ts"] <= inner_event["ts"]
+    assert (
+        inner_event["ts"] + inner_event["dur"] <= outer_event["ts"] + outer_event["dur"]
+    )
+
+
+def test_count_emits_cumulative_counter_events():
+    tracing.enable()
+    tracing.count("fft_calls")
+    tracing.count("fft_calls", 2)
+    tracing.count("aliased_frames", 5)
+
+    assert [e["args"] for e in events("C")] == [
+        {"fft_calls": 1},
+        {"fft_calls": 3},
+        {"aliased_frames": 5},
+    ]
+    assert tracing.counters() == {"fft_calls": 3, "aliased_frames": 5}
+
+
+def test_iteration_callback_labels_only_first_span_as_setup():
+    tracing.enable()
+    callback = tracing.iteration_callback("fista.iteration")
+    for _ in range(3):
+        callback(None)
+
+    spans = events("X")
+    assert [e["name"] for e in spans] == [
+        "fista.iteration.setup",
+        "fista.iteration",
+        "fista.iteration",
+    ]
+    assert [e["args"]["iteration"] for e in spans] == [0, 1, 2]
+    for previous, current in zip(spans, spans[1:]):
+        assert current["ts"] == previous["ts"] + previous["dur"]
+
+
+def test_memory_tracking_records_span_allocations():
+    tracing.enable(memory=True)
+    with tracing.span("outer"):
+        with tracing.span("inner"):
+            block = bytearray(1 << 20)
+        del block
+
+    inner_event, outer_event = events("X")
+    assert inner_event["args"]["alloc_bytes"] >= 1 << 20
+    assert inner_event["args"]["peak_bytes"] >= 1 << 20
+    # The buffer was freed inside ``outer``, but its peak is still reported
+    assert outer_event["args"]["alloc_bytes"] < 1 << 20
+    assert outer_event["args"]["peak_bytes"] >= 1 << 20
+    assert [e["name"] for e in events("C")] == ["traced_memory", "traced_memory"]
+
+
+def test_export_writes_chrome_trace(tmp_path):
+    tracing.enable()
+    with tracing.span("work"):
+        tracing.count("fft_calls", 4)
+
+    path = tracing.export(tmp_path / "trace.json")
+    with open(path) as f:
+        trace = json.load(f)
+
+    assert trace["displayTimeUnit"] == "ms"
+    assert {e["ph"] for e in trace["traceEvents"]} == {"X", "C"}
+    assert trace["otherData"]["counters"] == {"fft_calls": 4}
+
+
+def test_export_requires_a_path():
+    with pytest.raises(ValueError, match="no trace output path"):
+        tracing.export()
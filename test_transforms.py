@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+import transforms
+
+scipy_fft = pytest.importorskip("scipy.fft")
+
+DTYPES = [np.float32, np.float64, np.complex64, np.complex128]
+NORMS = [None, "ortho"]
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    previous = transforms.current_backend()
+    transforms.clear_choices()
+    yield
+    transforms.set_backend(previous)
+    transforms.clear_choices()
+
+
+def random_array(shape, dtype, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.standard_normal(shape)
+    if np.issubdtype(dtype, np.complexfloating):
+        x = x + 1j * rng.standard_normal(shape)
+    return x.astype(dtype)
+
+
+def assert_matches_scipy(result, expected):
+    assert result.dtype == expected.dtype
+    rtol = 1e-4 if expected.dtype in (np.float32, np.complex64) else 1e-10
+    np.testing.assert_allclose(result, expected, rtol=rtol, atol=rtol)
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 8, 33])
+@pytest.mark.parametrize("dtype", DTYPES)
+@pytest.mark.parametrize("norm", NORMS)
+@pytest.mark.parametrize("op", ["dct", "idct"])
+def test_numpy_dct_matches_scipy(op, norm, dtype, n):
+    transforms.set_backend("numpy")
+    x = random_array((3, n), dtype)
+    assert_matches_scipy(
+        getattr(transforms, op)(x, norm=norm), getattr(scipy_fft, op)(x, norm=norm)
+    )
+    assert_matches_scipy(
+        getattr(transforms, op)(x.T, axis=0, norm=norm),
+        getattr(scipy_fft, op)(x.T, axis=0, norm=norm),
+    )
+
+
+@pytest.mark.parametrize("dtype", DTYPES)
+@pytest.mark.parametrize("norm", NORMS)
+@pytest.mark.parametrize("op", ["dctn", "idctn"])
+def test_numpy_dctn_matches_scipy(op, norm, dtype):
+    transforms.set_backend("numpy")
+    x = random_array((9, 16, 5), dtype)
+    for axes in (None, [0, 1], (2, 0), 1):
+        assert_matches_scipy(
+            getattr(transforms, op)(x, axes=axes, norm=norm),
+            getattr(scipy_fft, op)(x, axes=axes, norm=norm),
+        )
+
+
+@pytest.mark.parametrize("backend", ["numpy", "scipy", "pyfftw"])
+@pytest.mark.parametrize("dtype", DTYPES)
+@pytest.mark.parametrize(
+    "op", ["fft", "ifft", "fft2", "ifft2", "rfft", "irfft", "dct", "idct", "dctn", "idctn"]
+)
+def test_backends_match_scipy(backend, op, dtype):
+    if backend not in transforms.available_backends():
+        pytest.skip(f"{backend} is not installed")
+    if op in ("rfft", "irfft") and np.issubdtype(dtype, np.complexfloating):
+        pytest.skip(f"{op} takes real input")
+    transforms.set_backend(backend)
+    x = random_array((6, 10), dtype)
+    if op == "irfft":
+        # Hermitian half-spectrum of the real input, as irfft expects
+        x = scipy_fft.rfft(x)
+    assert_matches_scipy(getattr(transforms, op)(x), getattr(scipy_fft, op)(x))
+
+
+def test_irfft_round_trip():
+    x = random_array((4, 33), np.float64)
+    np.testing.assert_allclose(transforms.irfft(transforms.rfft(x), n=33), x)
+
+
+def test_autotune_accepts_list_and_int_axes():
+    x = random_array((8, 8), np.float64)
+    expected = scipy_fft.dctn(x, norm="ortho")
+    np.testing.assert_allclose(transforms.dctn(x, axes=[0, 1], norm="ortho"), expected)
+    np.testing.assert_allclose(
+        transforms.dctn(x, axes=1, norm="ortho"), scipy_fft.dctn(x, axes=1, norm="ortho")
+    )
+
+
+def test_autotune_skips_failing_backends(monkeypatch):
+    transforms.available_backends()
+
+    def broken(*args, **kwargs):
+        raise TypeError("unsupported input")
+
+    monkeypatch.setitem(transforms._backends["numpy"], "dct", broken)
+    x = random_array(16, np.complex128)
+    np.testing.assert_allclose(transforms.dct(x), scipy_fft.dct(x))
+    assert "numpy" not in transforms.choices().values()
+
+
+def test_autotune_raises_when_every_backend_fails(monkeypatch):
+    def broken(*args, **kwargs):
+        raise TypeError("unsupported input")
+
+    for name in transforms.available_backends():
+        monkeypatch.setitem(transforms._backends[name], "dct", broken)
+    with pytest.raises(TypeError, match="unsupported input"):
+        transforms.dct(np.ones(8))
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="unknown or unavailable backend"):
+        transforms.set_backend("cupy")
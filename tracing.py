@@ -0,0 +1,246 @@
+"""Lightweight span/counter tracing with Chrome trace (Perfetto) export.
+
+Tracing is off by default and every hook is a cheap no-op until enabled,
+either with ``enable()`` or by setting ``DSP_TRACE=<output.json>`` before
+running a script (the trace is then written at interpreter exit).
+Open the resulting file in https://ui.perfetto.dev or chrome://tracing.
+
+With ``enable(memory=True)`` (or ``DSP_TRACE_MEMORY=1``) allocations are
+measured with tracemalloc: every span records ``alloc_bytes`` (net change
+in traced memory) and ``peak_bytes`` (peak above its starting point,
+including nested spans), and a ``traced_memory`` counter tracks the
+current total. tracemalloc is process-wide, so this assumes spans are
+opened from a single thread.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+TRACE_ENV = "DSP_TRACE"
+TRACE_MEMORY_ENV = "DSP_TRACE_MEMORY"
+
+_enabled = False
+_track_memory = False
+_started_tracemalloc = False
+_memory_stack = []
+_output_path = None
+_events = []
+_counters = {}
+_lock = threading.Lock()
+_pid = os.getpid()
+_t0 = time.perf_counter_ns()
+
+
+def _now_us():
+    return (time.perf_counter_ns() - _t0) / 1000.0
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        if _track_memory:
+            _enter_memory()
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, *exc):
+        end = _now_us()
+        if _track_memory and _memory_stack:
+            alloc_bytes, peak_bytes = _exit_memory()
+            self.args = dict(self.args, alloc_bytes=alloc_bytes, peak_bytes=peak_bytes)
+        event = {
+            "name": self.name,
+            "cat": self.cat,
+            "ph": "X",
+            "ts": self.start,
+            "dur": end - self.start,
+            "pid": _pid,
+            "tid": threading.get_ident(),
+        }
+        if self.args:
+            event["args"] = self.args
+        _events.append(event)
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+def _enter_memory():
+    current, peak = tracemalloc.get_traced_memory()
+    if _memory_stack:
+        # Fold the parent's peak so far in before resetting it for this span
+        _memory_stack[-1][1] = max(_memory_stack[-1][1], peak)
+    tracemalloc.reset_peak()
+    _memory_stack.append([current, current])
+
+
+def _exit_memory():
+    current, peak = tracemalloc.get_traced_memory()
+    start, seen = _memory_stack.pop()
+    peak = max(seen, peak)
+    if _memory_stack:
+        _memory_stack[-1][1] = max(_memory_stack[-1][1], peak)
+    _counter_event("traced_memory", current)
+    return current - start, peak - start
+
+
+def enable(output_path=None, memory=False):
+    global _enabled, _output_path, _track_memory, _started_tracemalloc
+    _enabled = True
+    if output_path is not None:
+        _output_path = output_path
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    _track_memory = memory
+
+
+def disable():
+    global _enabled, _track_memory, _started_tracemalloc
+    _enabled = False
+    _track_memory = False
+    _memory_stack.clear()
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _events.clear()
+        _counters.clear()
+
+
+def span(name, cat="dsp", **args):
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+def traced(name=None, cat="dsp"):
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, cat, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _counter_event(name, value):
+    _events.append(
+        {
+            "name": name,
+            "ph": "C",
+            "ts": _now_us(),
+            "pid": _pid,
+            "args": {name: value},
+        }
+    )
+
+
+def count(name, value=1):
+    if not _enabled:
+        return
+    with _lock:
+        total = _counters.get(name, 0) + value
+        _counters[name] = total
+    _counter_event(name, total)
+
+
+def iteration_callback(name, cat="solver"):
+    # Returns a solver callback that emits one span per iteration, measured
+    # between successive calls, or None when tracing is disabled. Solvers
+    # only call back after an iteration, so the first span runs from the
+    # callback's creation and is labelled "<name>.setup": it covers solver
+    # setup (e.g. step-size estimation) plus iteration 0.
+    if not _enabled:
+        return None
+    last = [_now_us()]
+    index = [0]
+
+    def callback(*_):
+        now = _now_us()
+        _events.append(
+            {
+                "name": name if index[0] else f"{name}.setup",
+                "cat": cat,
+                "ph": "X",
+                "ts": last[0],
+                "dur": now - last[0],
+                "pid": _pid,
+                "tid": threading.get_ident(),
+                "args": {"iteration": index[0]},
+            }
+        )
+        last[0] = now
+        index[0] += 1
+
+    return callback
+
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+
+def export(path=None):
+    path = path or _output_path
+    if path is None:
+        raise ValueError("no trace output path given")
+    with _lock:
+        events = list(_events)
+    trace = {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"counters": counters()},
+    }
+    with open(path, "w") as f:
+        json.dump(trace, f)
+    return path
+
+
+def _export_at_exit():
+    if _output_path is not None and _events:
+        export(_output_path)
+
+
+if os.environ.get(TRACE_ENV):
+    enable(os.environ[TRACE_ENV], memory=bool(os.environ.get(TRACE_MEMORY_ENV)))
+atexit.register(_export_at_exit)
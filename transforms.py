@@ -0,0 +1,381 @@
+"""FFT/rFFT/DCT transforms with interchangeable numpy, scipy and pyFFTW backends.
+
+All backends share the call signatures below. By default the first call for
+a given (transform, shape, dtype, arguments) times every available backend
+once and caches the fastest; ``set_backend`` (or ``DSP_FFT_BACKEND``) pins
+one instead, and ``set_workers`` controls the thread count of scipy/pyFFTW.
+DCTs are type II with scipy's normalisation conventions.
+"""
+
+import functools
+import os
+import time
+
+import numpy as np
+
+import tracing
+
+BACKEND_ENV = "DSP_FFT_BACKEND"
+OPS = ("fft", "ifft", "fft2", "ifft2", "rfft", "irfft", "dct", "idct", "dctn", "idctn")
+
+_workers = -1
+_forced_backend = os.environ.get(BACKEND_ENV) or None
+_backends = {}
+_choices = {}
+
+
+############################
+# numpy backend (FFT-only) #
+############################
+# numpy has no DCT, so it is computed with one complex FFT of the even/odd
+# reordered input (Makhoul, 1980).
+def _normalise_axes(axes):
+    if axes is None:
+        return None
+    if np.ndim(axes) == 0:
+        return (int(axes),)
+    return tuple(int(axis) for axis in axes)
+
+
+def _ortho_scale(n, dtype):
+    scale = np.full(n, np.sqrt(1 / (2 * n)), dtype=dtype)
+    scale[0] = np.sqrt(1 / (4 * n))
+    return scale
+
+
+def _twiddle(k, n, sign, dtype):
+    return np.exp(sign * 1j * np.pi * k / (2 * n)).astype(
+        np.result_type(dtype, np.complex64)
+    )
+
+
+def _keep_precision(transform):
+    # Results keep the input precision like scipy's (float32 stays float32)
+    # and complex input is transformed as its real and imaginary parts
+    @functools.wraps(transform)
+    def wrapper(x, axis=-1, norm=None):
+        x = np.asarray(x)
+        dtype = np.result_type(x, np.float32)
+        if np.iscomplexobj(x):
+            out = np.empty(x.shape, dtype=dtype)
+            out.real = transform(x.real, axis, norm)
+            out.imag = transform(x.imag, axis, norm)
+            return out
+        return transform(x.astype(dtype, copy=False), axis, norm).astype(dtype, copy=False)
+
+    return wrapper
+
+
+@_keep_precision
+def _numpy_dct(x, axis, norm):
+    x = np.moveaxis(x, axis, -1)
+    n = x.shape[-1]
+    v = np.concatenate([x[..., ::2], x[..., 1::2][..., ::-1]], axis=-1)
+    y = np.real(np.fft.fft(v, axis=-1) * (2 * _twiddle(np.arange(n), n, -1, x.dtype)))
+    if norm == "ortho":
+        y *= _ortho_scale(n, y.dtype)
+    return np.moveaxis(y, -1, axis)
+
+
+@_keep_precision
+def _numpy_idct(y, axis, norm):
+    y = np.moveaxis(y, axis, -1)
+    n = y.shape[-1]
+    if norm == "ortho":
+        y = y / _ortho_scale(n, y.dtype)
+    half = n // 2 + 1
+    y_rev = np.zeros_like(y[..., :half])
+    y_rev[..., 1:] = y[..., ::-1][..., : half - 1]
+    twiddle = 0.5 * _twiddle(np.arange(half), n, 1, y.dtype)
+    v = np.fft.irfft(twiddle * (y[..., :half] - 1j * y_rev), n=n, axis=-1)
+    x = np.empty_like(v)
+    x[..., ::2] = v[..., : (n + 1) // 2]
+    x[..., 1::2] = v[..., (n + 1) // 2 :][..., ::-1]
+    return np.moveaxis(x, -1, axis)
+
+
+def _numpy_dctn(x, axes=None, norm=None):
+    x = np.asarray(x)
+    for axis in range(x.ndim) if axes is None else _normalise_axes(axes):
+        x = _numpy_dct(x, axis=axis, norm=norm)
+    return x
+
+
+def _numpy_idctn(y, axes=None, norm=None):
+    y = np.asarray(y)
+    for axis in range(y.ndim) if axes is None else _normalise_axes(axes):
+        y = _numpy_idct(y, axis=axis, norm=norm)
+    return y
+
+
+def _make_numpy_backend():
+    return {
+        "fft": np.fft.fft,
+        "ifft": np.fft.ifft,
+        "fft2": np.fft.fft2,
+        "ifft2": np.fft.ifft2,
+        "rfft": np.fft.rfft,
+        "irfft": np.fft.irfft,
+        "dct": _numpy_dct,
+        "idct": _numpy_idct,
+        "dctn": _numpy_dctn,
+        "idctn": _numpy_idctn,
+    }
+
+
+################################
+# scipy / pyFFTW (workers=...) #
+################################
+def _with_workers(module):
+    def bind(func):
+        return lambda *args, **kwargs: func(*args, workers=_workers, **kwargs)
+
+    return {op: bind(getattr(module, op)) for op in OPS}
+
+
+def _make_scipy_backend():
+    import scipy.fft
+
+    return _with_workers(scipy.fft)
+
+
+def _split_complex(func):
+    # pyFFTW's DCTs are real-to-real only and reject complex input, so its
+    # real and imaginary parts are transformed separately
+    @functools.wraps(func)
+    def wrapper(x, **kwargs):
+        if not np.iscomplexobj(x):
+            return func(x, **kwargs)
+        out = np.empty(x.shape, dtype=x.dtype)
+        out.real = func(x.real, **kwargs)
+        out.imag = func(x.imag, **kwargs)
+        return out
+
+    return wrapper
+
+
+def _make_pyfftw_backend():
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft
+
+    # Reuse FFTW plans across calls instead of re-planning every transform
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(60)
+    backend = _with_workers(pyfftw.interfaces.scipy_fft)
+    for op in ("dct", "idct", "dctn", "idctn"):
+        backend[op] = _split_complex(backend[op])
+    return backend
+
+
+_BACKEND_FACTORIES = {
+    "numpy": _make_numpy_backend,
+    "scipy": _make_scipy_backend,
+    "pyfftw": _make_pyfftw_backend,
+}
+
+
+def _load_backend(name):
+    if name not in _backends:
+        try:
+            _backends[name] = _BACKEND_FACTORIES[name]()
+        except ImportError:
+            _backends[name] = None
+    return _backends[name]
+
+
+def available_backends():
+    return [name for name in _BACKEND_FACTORIES if _load_backend(name) is not None]
+
+
+def _get_backend(name):
+    backend = _load_backend(name) if name in _BACKEND_FACTORIES else None
+    if backend is None:
+        raise ValueError(
+            f"unknown or unavailable backend {name!r}, choose from {available_backends()}"
+        )
+    return backend
+
+
+def set_backend(name):
+    global _forced_backend
+    if name is not None:
+        _get_backend(name)
+    _forced_backend = name
+
+
+def current_backend():
+    # The pinned backend name, or None when backends are autotuned
+    return _forced_backend
+
+
+def set_workers(workers):
+    global _workers
+    _workers = workers
+    _choices.clear()
+
+
+def choices():
+    return dict(_choices)
+
+
+def clear_choices():
+    _choices.clear()
+
+
+###########################
+# Autotuning and dispatch #
+###########################
+def _autotune(op, x, kwargs, repeats=3):
+    # Backends that fail on this input are dropped from the candidates
+    timings = {}
+    error = None
+    with tracing.span("transforms.autotune", op=op, shape=list(x.shape)):
+        for name in available_backends():
+            func = _backends[name][op]
+            try:
+                func(x, **kwargs)  # warm-up, lets pyFFTW plan
+                best = float("inf")
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    func(x, **kwargs)
+                    best = min(best, time.perf_counter() - start)
+            except Exception as exc:
+                error = exc
+                continue
+            timings[name] = best
+    if not timings:
+        raise error
+    return min(timings, key=timings.get)
+
+
+def _select_backend(op, x, kwargs):
+    if _forced_backend is not None:
+        return _forced_backend
+    key = (op, x.shape, x.dtype.str, tuple(kwargs.items()))
+    backend = _choices.get(key)
+    if backend is None:
+        backend = _choices[key] = _autotune(op, x, kwargs)
+    return backend
+
+
+def _dispatch(op, x, **kwargs):
+    x = np.asarray(x)
+    if "axes" in kwargs:
+        kwargs["axes"] = _normalise_axes(kwargs["axes"])
+    if kwargs.get("n") is not None:
+        kwargs["n"] = int(kwargs["n"])
+    backend = _select_backend(op, x, kwargs)
+    func = _get_backend(backend)[op]
+    tracing.count("fft_calls")
+    with tracing.span(op, cat="transform", backend=backend):
+        return func(x, **kwargs)
+
+
+def fft(x, n=None, axis=-1, norm=None):
+    return _dispatch("fft", x, n=n, axis=axis, norm=norm)
+
+
+def ifft(x, n=None, axis=-1, norm=None):
+    return _dispatch("ifft", x, n=n, axis=axis, norm=norm)
+
+
+def fft2(x, axes=(-2, -1), norm=None):
+    return _dispatch("fft2", x, axes=axes, norm=norm)
+
+
+def ifft2(x, axes=(-2, -1), norm=None):
+    return _dispatch("ifft2", x, axes=axes, norm=norm)
+
+
+def rfft(x, n=None, axis=-1, norm=None):
+    return _dispatch("rfft", x, n=n, axis=axis, norm=norm)
+
+
+def irfft(x, n=None, axis=-1, norm=None):
+    return _dispatch("irfft", x, n=n, axis=axis, norm=norm)
+
+
+def dct(x, axis=-1, norm=None):
+    return _dispatch("dct", x, axis=axis, norm=norm)
+
+
+def idct(x, axis=-1, norm=None):
+    return _dispatch("idct", x, axis=axis, norm=norm)
+
+
+def dctn(x, axes=None, norm=None):
+    return _dispatch("dctn", x, axes=axes, norm=norm)
+
+
+def idctn(x, axes=None, norm=None):
+    return _dispatch("idctn", x, axes=axes, norm=norm)
+
+
+class BatchedRFFT:
+    # rFFT along the last axis of up to ``max_rows`` real rows of length
+    # ``n``, written into a caller-provided (rows, n // 2 + 1) complex buffer.
+    # The backend is autotuned once for the full (max_rows, n) shape, so
+    # varying batch sizes never trigger autotuning mid-stream. With pyFFTW,
+    # plans for power-of-two batch sizes are built up front and write
+    # straight into ``out``; numpy and scipy.fft have no ``out=``, so there
+    # the spectrum is computed into a temporary and copied.
+    def __init__(self, max_rows, n, dtype="float64"):
+        self.max_rows = max_rows
+        self.n = n
+        self.dtype = np.dtype(dtype)
+        template = np.zeros((max_rows, n), dtype=self.dtype)
+        kwargs = {"n": None, "axis": -1, "norm": None}
+        self.backend = _select_backend("rfft", template, kwargs)
+        self._func = _get_backend(self.backend)["rfft"]
+        self._plans = {}
+        if self.backend == "pyfftw":
+            import pyfftw
+
+            threads = os.cpu_count() if _workers < 0 else _workers
+            out_dtype = np.result_type(self.dtype, np.complex64)
+            rows = 1
+            while rows <= max_rows:
+                self._plans[rows] = pyfftw.FFTW(
+                    np.empty((rows, n), dtype=self.dtype),
+                    np.empty((rows, n // 2 + 1), dtype=out_dtype),
+                    axes=(-1,),
+                    flags=("FFTW_ESTIMATE", "FFTW_UNALIGNED"),
+                    threads=threads,
+                )
+                rows *= 2
+
+    def __call__(self, x, out):
+        x = np.ascontiguousarray(x, dtype=self.dtype)
+        count = len(x)
+        if count > self.max_rows:
+            raise ValueError(f"{count} rows exceed max_rows={self.max_rows}")
+        out = out[:count]
+        tracing.count("fft_calls")
+        with tracing.span("rfft", cat="transform", backend=self.backend, rows=count):
+            if not self._plans:
+                out[...] = self._func(x, axis=-1)
+                return out
+            # Cover ``count`` rows with the largest power-of-two plans
+            start = 0
+            while start < count:
+                rows = 1 << ((count - start).bit_length() - 1)
+                plan = self._plans[rows]
+                plan.update_arrays(x[start : start + rows], out[start : start + rows])
+                plan.execute()
+                start += rows
+        return out
+
+
+def dctn_operator(dims, dtype="float64"):
+    # Orthonormal N-D DCT as a pylops operator, a drop-in for
+    # pylops.signalprocessing.DCT(dims=dims) that runs through this module
+    import pylops
+
+    size = int(np.prod(dims))
+    return pylops.FunctionOperator(
+        lambda x: dctn(x.reshape(dims), norm="ortho").ravel(),
+        lambda y: idctn(y.reshape(dims), norm="ortho").ravel(),
+        size,
+        size,
+        dtype=dtype,
+    )